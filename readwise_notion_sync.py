@@ -9,13 +9,20 @@ Usage:
     python readwise_notion_sync.py --days 7     # Sync last 7 days
     python readwise_notion_sync.py --days 30    # Sync last 30 days
     python readwise_notion_sync.py --all        # Sync everything (ignore last sync time)
+    python readwise_notion_sync.py --rebuild-index  # Rebuild the highlight index from page content
 """
 
 import os
-import requests
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-import json
+import re
+import hashlib
+import unicodedata
+import asyncio
+import httpx
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Tuple
+import orjson
+import sqlite3
 from pathlib import Path
 import argparse
 
@@ -35,15 +42,55 @@ if DAYS_TO_SYNC:
     except:
         DAYS_TO_SYNC = None
 
+# OPTIONAL: Double-check Readwise's date filter on the client side
+# Only needed if the API ever returns items without new highlights - set to "true" to enable
+VERIFY_API_FILTER = os.getenv('VERIFY_API_FILTER', '').lower() in ('1', 'true', 'yes')
+
+# OPTIONAL: Always read the whole Notion database to find existing pages, instead of
+# searching for each title. Set to "true" to force it (it's used automatically when many
+# items changed and the library is small enough - see FULL_SCAN_* below)
+SCAN_ALL_PAGES = os.getenv('SCAN_ALL_PAGES', '').lower() in ('1', 'true', 'yes')
+
 READWISE_API_BASE = "https://readwise.io/api/v2"
 NOTION_API_BASE = "https://api.notion.com/v1"
 
+# Connection pool size per API and per-request timeout (seconds)
+MAX_CONNECTIONS = 20
+REQUEST_TIMEOUT = 60
+
+# Retry rate-limited (429) and temporarily unavailable (502/503) responses
+# with exponential backoff: 0.5s, 1s, 2s, 4s, ... (or longer if Retry-After says so)
+MAX_RETRIES = 6
+RETRY_BASE_DELAY = 0.5
+RETRY_STATUSES = {429, 502, 503}
+
+# Notion allows an average of 3 requests/second per integration - stay just under it
+NOTION_REQUESTS_PER_SECOND = 2.5
+
+# How many items are processed at once (the rate limiter is the real throttle,
+# this just bounds how much work is in flight)
+MAX_CONCURRENT_ITEMS = 5
+
 # File to track last sync time
 LAST_SYNC_FILE = Path(__file__).parent / ".last_sync_time.json"
 
-# File to track items that have been synced (so we don't recreate deleted ones)
+# Database tracking items that have been synced (so we don't recreate deleted ones)
+# and which highlights each item's page already has (so we don't re-read the page)
+SYNCED_ITEMS_DB = Path(__file__).parent / ".synced_items.db"
+
+# Previous JSON tracking file - imported into the database once, then no longer used
 SYNCED_ITEMS_FILE = Path(__file__).parent / ".synced_items.json"
 
+# Patterns used to normalize highlight text for comparison (compiled once)
+MARKDOWN_RE = re.compile(r'[*_]+')  # bold/italic markers: **, *, __, _
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Read the whole database (one request per 100 pages) instead of running title searches
+# when more than FULL_SCAN_MIN_TITLES items changed - unless the database turns out to hold
+# more than FULL_SCAN_MAX_PAGES pages, in which case we stop reading and search instead
+FULL_SCAN_MIN_TITLES = 50
+FULL_SCAN_MAX_PAGES = 1000
+
 # Category mapping from Readwise to your Notion categories
 CATEGORY_MAP = {
     "books": "Books",
@@ -54,6 +101,31 @@ CATEGORY_MAP = {
 }
 
 
+class AsyncRateLimiter:
+    """Token bucket limiter: allows `rate` requests per second on average, with small bursts"""
+    
+    def __init__(self, rate: float, burst: int = 3):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a request is allowed, then consume a token"""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
 class ReadwiseNotionSync:
     def __init__(self):
         self.readwise_headers = {
@@ -64,35 +136,197 @@ class ReadwiseNotionSync:
             "Content-Type": "application/json",
             "Notion-Version": "2022-06-28"
         }
+        # One client per API (headers differ). HTTP/2 multiplexes concurrent requests over a
+        # single connection, so there's one TCP+TLS handshake per API instead of one per request
+        self.rw_client = self._create_client(self.readwise_headers)
+        self.notion_client = self._create_client(self.notion_headers)
+        # Every Notion request (including retries) waits for a token first
+        self.notion_limiter = AsyncRateLimiter(rate=NOTION_REQUESTS_PER_SECOND)
+        self.work_semaphore = asyncio.Semaphore(MAX_CONCURRENT_ITEMS)
         self.last_sync_time = self.load_last_sync_time()
+        self.db = self.open_synced_items_db()
         self.synced_items = self.load_synced_items()
+        self.deleted_items = self.load_deleted_items()
+        # When False, re-check the Readwise date filter on the client side
+        self.trust_api_filter = not VERIFY_API_FILTER
     
-    def load_synced_items(self) -> set:
-        """Load the set of Readwise IDs that have been synced before"""
-        if SYNCED_ITEMS_FILE.exists():
+    def _create_client(self, headers: Dict) -> httpx.AsyncClient:
+        """Create an HTTP/2 client with a pooled connection limit"""
+        return httpx.AsyncClient(
+            headers=headers,
+            http2=True,
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS)
+        )
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    async def close(self):
+        """Close the HTTP clients and the tracking database"""
+        await self.rw_client.aclose()
+        await self.notion_client.aclose()
+        self.db.close()
+    
+    async def _request(self, client: httpx.AsyncClient, method: str, url: str,
+                       error_message: Optional[str] = None,
+                       limiter: Optional[AsyncRateLimiter] = None,
+                       retry_server_errors: bool = True, **kwargs) -> Dict:
+        """
+        Send a request and return the JSON body
+        Retries 429s (honoring Retry-After) and 502/503 errors with exponential backoff
+        Pass retry_server_errors=False for requests that aren't safe to repeat (only 429s are retried)
+        """
+        retry_statuses = RETRY_STATUSES if retry_server_errors else {429}
+        
+        # Serialize request bodies with orjson too (Content-Type is set in the client headers)
+        if 'json' in kwargs:
+            kwargs['content'] = orjson.dumps(kwargs.pop('json'))
+        # httpx replaces the URL's query string with params - even an empty dict - which
+        # would drop the cursor from Readwise's "next" pagination URLs
+        if not kwargs.get('params'):
+            kwargs.pop('params', None)
+        
+        for attempt in range(MAX_RETRIES):
+            if limiter:
+                await limiter.acquire()
+            
+            response = await client.request(method, url, **kwargs)
+            
+            if response.status_code not in retry_statuses or attempt == MAX_RETRIES - 1:
+                # Print detailed error if it fails
+                if not response.is_success and error_message:
+                    print(f"\n⚠️  {error_message}:")
+                    print(f"   Status: {response.status_code}")
+                    print(f"   Response: {response.text}")
+                
+                response.raise_for_status()
+                # orjson parses Notion's verbose block payloads several times faster than json
+                return orjson.loads(response.content)
+            
+            delay = (2 ** attempt) * RETRY_BASE_DELAY
+            if response.status_code == 429:
+                try:
+                    delay = max(float(response.headers.get('Retry-After', 0)), delay)
+                except ValueError:
+                    pass
+            
+            print(f"      ⏳ Got {response.status_code}, retrying in {delay:.1f}s (attempt {attempt + 1}/{MAX_RETRIES - 1})...")
+            await asyncio.sleep(delay)
+    
+    async def _readwise_request(self, method: str, url: str, **kwargs) -> Dict:
+        """Send a request to the Readwise API (with retries)"""
+        return await self._request(self.rw_client, method, url, **kwargs)
+    
+    async def _notion_request(self, method: str, url: str, **kwargs) -> Dict:
+        """Send a request to the Notion API (with retries)"""
+        return await self._request(self.notion_client, method, url, limiter=self.notion_limiter, **kwargs)
+    
+    def open_synced_items_db(self) -> sqlite3.Connection:
+        """
+        Open (and create if needed) the tracking database
+        synced: one row per synced item - its page, whether its highlight index can be trusted,
+                and whether its page was deleted from Notion
+        synced_highlights: the Readwise highlights already on each item's page
+        """
+        db = sqlite3.connect(SYNCED_ITEMS_DB)
+        with db:
+            db.execute("CREATE TABLE IF NOT EXISTS synced (id INTEGER PRIMARY KEY, page_id TEXT, indexed INTEGER NOT NULL DEFAULT 0, "
+                       "deleted INTEGER NOT NULL DEFAULT 0)")
+            db.execute("CREATE TABLE IF NOT EXISTS synced_highlights (id INTEGER PRIMARY KEY, book_id INTEGER NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS synced_highlights_book_id ON synced_highlights (book_id)")
+        
+        # One-time import of the old JSON tracking file
+        if SYNCED_ITEMS_FILE.exists() and db.execute("SELECT COUNT(*) FROM synced").fetchone()[0] == 0:
             try:
-                with open(SYNCED_ITEMS_FILE, 'r') as f:
-                    data = json.load(f)
-                    return set(data.get('synced_ids', []))
+                with open(SYNCED_ITEMS_FILE, 'rb') as f:
+                    data = orjson.loads(f.read())
+                
+                with db:
+                    # Just a list of IDs - each page's highlight index is built the first time it's updated
+                    db.executemany("INSERT OR IGNORE INTO synced (id) VALUES (?)",
+                                   [(book_id,) for book_id in data.get('synced_ids', [])])
+                print(f"📦 Imported {SYNCED_ITEMS_FILE.name} into {SYNCED_ITEMS_DB.name}")
             except:
                 pass
-        return set()
+        
+        return db
+    
+    def load_synced_items(self) -> set:
+        """Load the set of Readwise IDs that have been synced before"""
+        return {row[0] for row in self.db.execute("SELECT id FROM synced")}
+    
+    def load_deleted_items(self) -> set:
+        """Load the set of Readwise IDs whose pages were deleted from Notion"""
+        return {row[0] for row in self.db.execute("SELECT id FROM synced WHERE deleted = 1")}
     
     def save_synced_items(self, readwise_ids: list):
-        """Save the list of Readwise IDs that have been synced"""
-        # Add new IDs to existing set
-        self.synced_items.update(readwise_ids)
+        """Save the list of Readwise IDs that have been synced (only new rows are written)"""
+        # Skip IDs we already track, so the write is proportional to what's new this run
+        new_ids = set(readwise_ids) - self.synced_items
+        if new_ids:
+            with self.db:
+                self.db.executemany("INSERT OR IGNORE INTO synced (id) VALUES (?)", [(book_id,) for book_id in new_ids])
         
-        with open(SYNCED_ITEMS_FILE, 'w') as f:
-            json.dump({'synced_ids': list(self.synced_items)}, f)
+        # Add new IDs to existing set
+        self.synced_items.update(new_ids)
         print(f"💾 Tracked {len(self.synced_items)} total synced items")
     
+    def get_synced_highlight_ids(self, book_id: int, page_id: str) -> Optional[set]:
+        """
+        Get the Readwise highlight IDs already on this item's page
+        Returns None if there's no trustworthy index (never indexed, or the page changed)
+        """
+        row = self.db.execute("SELECT page_id, indexed FROM synced WHERE id = ?", (book_id,)).fetchone()
+        if not row or row[0] != page_id or not row[1]:
+            return None
+        return {row[0] for row in self.db.execute("SELECT id FROM synced_highlights WHERE book_id = ?", (book_id,))}
+    
+    def record_synced_page(self, book_id: int, page_id: str, highlight_ids):
+        """
+        Remember which page an item was synced to and add highlights to its index
+        Only call this once the index holds every highlight on the page - it's trusted from then on
+        """
+        with self.db:
+            self.db.execute(
+                "INSERT INTO synced (id, page_id, indexed) VALUES (?, ?, 1) "
+                "ON CONFLICT (id) DO UPDATE SET page_id = excluded.page_id, indexed = 1, deleted = 0",
+                (book_id, page_id)
+            )
+            self.db.executemany("INSERT OR REPLACE INTO synced_highlights (id, book_id) VALUES (?, ?)",
+                                [(highlight_id, book_id) for highlight_id in highlight_ids])
+        self.synced_items.add(book_id)
+    
+    def forget_all_highlight_indexes(self):
+        """Stop trusting every item's highlight index, so each page is re-read the next time it gets new highlights"""
+        with self.db:
+            self.db.execute("UPDATE synced SET indexed = 0")
+    
+    def mark_deleted(self, book_id: int):
+        """Remember that an item's page was deleted from Notion, so future syncs skip it up front"""
+        with self.db:
+            self.db.execute(
+                "INSERT INTO synced (id, deleted) VALUES (?, 1) "
+                "ON CONFLICT (id) DO UPDATE SET page_id = NULL, indexed = 0, deleted = 1",
+                (book_id,)
+            )
+        self.synced_items.add(book_id)
+        self.deleted_items.add(book_id)
+    
+    def forget_highlight_index(self, book_id: int):
+        """Stop trusting an item's highlight index (until it's rebuilt from the page)"""
+        with self.db:
+            self.db.execute("UPDATE synced SET indexed = 0 WHERE id = ?", (book_id,))
+    
     def load_last_sync_time(self) -> Optional[str]:
         """Load the timestamp of the last successful sync"""
         if LAST_SYNC_FILE.exists():
             try:
-                with open(LAST_SYNC_FILE, 'r') as f:
-                    data = json.load(f)
+                with open(LAST_SYNC_FILE, 'rb') as f:
+                    data = orjson.loads(f.read())
                     last_time = data.get('last_sync_time')
                     if last_time:
                         print(f"📅 Last sync was: {last_time}")
@@ -105,11 +339,11 @@ class ReadwiseNotionSync:
     def save_last_sync_time(self):
         """Save the current time as the last sync time"""
         current_time = datetime.utcnow().isoformat() + 'Z'
-        with open(LAST_SYNC_FILE, 'w') as f:
-            json.dump({'last_sync_time': current_time}, f)
+        with open(LAST_SYNC_FILE, 'wb') as f:
+            f.write(orjson.dumps({'last_sync_time': current_time}))
         print(f"💾 Saved last sync time: {current_time}")
     
-    def get_readwise_books(self, updated_after: Optional[str] = None) -> List[Dict]:
+    async def get_readwise_books(self, updated_after: Optional[str] = None) -> List[Dict]:
         """
         Fetch items from Readwise (books, articles, podcasts, tweets, etc.)
         Readwise API calls everything a 'book' but includes all content types
@@ -117,39 +351,40 @@ class ReadwiseNotionSync:
         url = f"{READWISE_API_BASE}/books/"
         params = {}
         
-        # Only get items with highlights created after this date
+        # Only get items updated after this date (the same filter as get_all_highlights_since, so
+        # items whose new highlights carry an older highlighted_at are still listed)
         if updated_after:
             # Format date properly for Readwise API (remove microseconds)
             if '.' in updated_after:
                 updated_after = updated_after.split('.')[0] + 'Z'
             
-            params['highlighted_after'] = updated_after
-            print(f"🔍 Fetching only items with highlights created since {updated_after}")
+            params['updated__gt'] = updated_after
+            print(f"🔍 Fetching only items updated since {updated_after}")
         
         all_books = []
         
         while url:
-            response = requests.get(url, params=params, headers=self.readwise_headers)
-            response.raise_for_status()
-            data = response.json()
+            data = await self._readwise_request('GET', url, params=params)
             
             all_books.extend(data.get('results', []))
             url = data.get('next')  # Pagination
             params = {}  # Clear params for subsequent pages
         
-        # BACKUP: Client-side filter if API filter didn't work properly
-        if updated_after and all_books:
+        # BACKUP: Client-side filter if API filter didn't work properly (opt-in, see VERIFY_API_FILTER)
+        if updated_after and all_books and not self.trust_api_filter:
             print(f"   📊 API returned {len(all_books)} items")
-            # Filter by last_highlight_at on client side as backup
+            # Filter by updated on client side as backup
             filtered_books = []
-            cutoff_date = updated_after.replace('Z', '')  # Remove Z for comparison
+            cutoff_date = self.parse_date(updated_after)  # Parse once, compare datetimes
             
             for book in all_books:
-                last_highlight = book.get('last_highlight_at', '')
-                if last_highlight:
-                    # Remove Z and compare
-                    highlight_date = last_highlight.replace('Z', '')
-                    if highlight_date >= cutoff_date:
+                updated = book.get('updated')
+                if updated:
+                    try:
+                        if self.parse_date(updated) >= cutoff_date:
+                            filtered_books.append(book)
+                    except ValueError:
+                        # Unexpected date format - keep the item rather than risk missing highlights
                         filtered_books.append(book)
             
             if len(filtered_books) < len(all_books):
@@ -158,7 +393,7 @@ class ReadwiseNotionSync:
         
         return all_books
     
-    def search_notion_page(self, title: str) -> Optional[Dict]:
+    async def search_notion_page(self, title: str) -> Optional[Dict]:
         """Check if a page with this title already exists in Library"""
         url = f"{NOTION_API_BASE}/databases/{NOTION_DATABASE_ID}/query"
         
@@ -171,106 +406,232 @@ class ReadwiseNotionSync:
             }
         }
         
-        response = requests.post(url, headers=self.notion_headers, json=payload)
-        response.raise_for_status()
+        data = await self._notion_request('POST', url, json=payload)
         
-        results = response.json().get('results', [])
+        results = data.get('results', [])
         return results[0] if results else None
     
-    def batch_search_notion_pages(self, titles: List[str]) -> Dict[str, Dict]:
+    async def batch_search_notion_pages(self, titles: List[str]) -> Dict[str, Dict]:
         """
         Search for multiple pages at once (much more efficient!)
-        Returns a dictionary mapping title -> page object
+        Returns a dictionary mapping normalized title (see normalize_title) -> page object
         """
         if not titles:
             return {}
         
         # Notion has limits on filter complexity, so batch in groups of 100
         MAX_BATCH_SIZE = 100
+        batches = [titles[i:i+MAX_BATCH_SIZE] for i in range(0, len(titles), MAX_BATCH_SIZE)]
+        
+        # Send all batches at once (the rate limiter keeps them under Notion's limit)
+        results = await asyncio.gather(*[
+            self._query_notion_batch(batch_titles, batch_number)
+            for batch_number, batch_titles in enumerate(batches, 1)
+        ])
+        
         all_pages = {}
+        for pages in results:
+            all_pages.update(pages)
         
-        for i in range(0, len(titles), MAX_BATCH_SIZE):
-            batch_titles = titles[i:i+MAX_BATCH_SIZE]
-            
-            url = f"{NOTION_API_BASE}/databases/{NOTION_DATABASE_ID}/query"
-            
-            # Build OR filter for all titles in this batch
-            if len(batch_titles) == 1:
-                filter_obj = {
-                    "property": "Title",
-                    "title": {
-                        "equals": batch_titles[0]
-                    }
+        return all_pages
+    
+    async def _query_notion_batch(self, batch_titles: List[str], batch_number: int) -> Dict[str, Dict]:
+        """Query the database for one batch of (up to 100) titles"""
+        url = f"{NOTION_API_BASE}/databases/{NOTION_DATABASE_ID}/query"
+        
+        # Build OR filter for all titles in this batch
+        if len(batch_titles) == 1:
+            filter_obj = {
+                "property": "Title",
+                "title": {
+                    "equals": batch_titles[0]
                 }
-            else:
-                filter_obj = {
-                    "or": [
-                        {
-                            "property": "Title",
-                            "title": {
-                                "equals": title
-                            }
+            }
+        else:
+            filter_obj = {
+                "or": [
+                    {
+                        "property": "Title",
+                        "title": {
+                            "equals": title
                         }
-                        for title in batch_titles
-                    ]
-                }
-            
-            payload = {"filter": filter_obj}
-            
-            response = requests.post(url, headers=self.notion_headers, json=payload)
-            
-            # Print detailed error if it fails
-            if not response.ok:
-                print(f"\n⚠️  Notion API Error:")
-                print(f"   Status: {response.status_code}")
-                print(f"   Response: {response.text}")
-                print(f"   Searching for {len(batch_titles)} titles (batch {i//MAX_BATCH_SIZE + 1})")
-            
-            response.raise_for_status()
+                    }
+                    for title in batch_titles
+                ]
+            }
+        
+        payload = {"filter": filter_obj}
+        
+        data = await self._notion_request(
+            'POST', url, json=payload,
+            error_message=f"Notion API Error (searching for {len(batch_titles)} titles, batch {batch_number})"
+        )
+        
+        return self.map_pages_by_title(data.get('results', []))
+    
+    async def fetch_all_titles_map(self, max_pages: Optional[int] = None) -> Optional[Dict[str, Dict]]:
+        """
+        Read every page in the database (no filter, 100 pages per request)
+        Cheaper than title searches when many items changed in a small library
+        Returns the same mapping as batch_search_notion_pages, or None if the
+        database holds more than max_pages pages
+        """
+        url = f"{NOTION_API_BASE}/databases/{NOTION_DATABASE_ID}/query"
+        payload = {"page_size": 100}
+        all_pages = {}
+        has_more = True
+        pages_read = 0
+        
+        while has_more:
+            if max_pages is not None and pages_read >= max_pages:
+                return None
             
-            results = response.json().get('results', [])
+            data = await self._notion_request('POST', url, json=payload, error_message="Notion API Error (reading database)")
             
-            # Build a map of title -> page for easy lookup
-            for page in results:
-                # Extract title from the page
-                title_prop = page.get('properties', {}).get('Title', {})
-                if title_prop.get('title'):
-                    page_title = title_prop['title'][0]['plain_text']
-                    all_pages[page_title] = page
+            results = data.get('results', [])
+            all_pages.update(self.map_pages_by_title(results))
+            pages_read += len(results)
+            has_more = data.get('has_more', False)
+            payload = {"page_size": 100, "start_cursor": data.get('next_cursor')}
         
         return all_pages
     
-    def get_highlights_for_book(self, book_id: int, updated_after: Optional[str] = None) -> List[Dict]:
+    async def find_existing_pages(self, titles: List[str]) -> Dict[str, Dict]:
         """
-        Get highlights for a specific book
-        If updated_after is provided, only return highlights created after that date
+        Find the existing pages for these titles, by reading the whole database when many
+        items changed (see FULL_SCAN_*) and by title searches otherwise
+        Returns the same mapping as batch_search_notion_pages
+        """
+        if SCAN_ALL_PAGES:
+            print(f"   Reading all pages in the database...")
+            return await self.fetch_all_titles_map()
+        
+        # Skip the read entirely if we already know the database is too big for it
+        tracked_pages = len(self.synced_items) - len(self.deleted_items)
+        if len(titles) > FULL_SCAN_MIN_TITLES and tracked_pages < FULL_SCAN_MAX_PAGES:
+            print(f"   Reading all pages in the database...")
+            pages_map = await self.fetch_all_titles_map(max_pages=FULL_SCAN_MAX_PAGES)
+            if pages_map is not None:
+                return pages_map
+            print(f"   Database has more than {FULL_SCAN_MAX_PAGES} pages - searching by title instead...")
+        
+        return await self.batch_search_notion_pages(titles)
+    
+    def map_pages_by_title(self, pages: List[Dict]) -> Dict[str, Dict]:
+        """Build a map of normalized title -> page for easy lookup"""
+        pages_map = {}
+        for page in pages:
+            # Extract title from the page
+            title_prop = page.get('properties', {}).get('Title', {})
+            if title_prop.get('title'):
+                # Titles with inline formatting are split into several text runs
+                page_title = ''.join(t.get('plain_text', '') for t in title_prop['title'])
+                pages_map[self.normalize_title(page_title)] = page
+        
+        return pages_map
+    
+    async def get_highlights_for_book(self, book_id: int) -> List[Dict]:
+        """
+        Get all highlights for a specific book
+        (incremental syncs get just the new ones for every item from get_all_highlights_since)
         """
         url = f"{READWISE_API_BASE}/highlights/"
-        params = {"book_id": book_id}
+        params = {"book_id": book_id, "page_size": 1000}
         
-        # Add date filter if specified (use highlighted_after to filter by creation date)
-        if updated_after:
-            params['highlighted_after'] = updated_after
+        highlights = []
+        
+        while url:
+            data = await self._readwise_request('GET', url, params=params)
+            
+            highlights.extend(data.get('results', []))
+            url = data.get('next')  # Pagination
+            params = {}  # Clear params for subsequent pages
+        
+        return highlights
+    
+    async def get_all_highlights_since(self, updated_after: str) -> Dict[int, List[Dict]]:
+        """
+        Get highlights added or changed after a date for ALL items in one paginated stream
+        (instead of one request per item)
+        Returns a dictionary mapping book_id -> list of highlights
+        """
+        url = f"{READWISE_API_BASE}/highlights/"
         
-        response = requests.get(url, params=params, headers=self.readwise_headers)
-        response.raise_for_status()
+        # Format date properly for Readwise API (remove microseconds)
+        if '.' in updated_after:
+            updated_after = updated_after.split('.')[0] + 'Z'
+        # Filter on updated, not highlighted_at: imported highlights can carry an older (or no)
+        # highlighted_at. Edited highlights come back too - append_highlights_to_page skips
+        # those (by the highlight index, or by date while the index is being rebuilt)
+        params = {"updated__gt": updated_after, "page_size": 1000}
         
-        return response.json().get('results', [])
+        highlights_by_book = {}
+        
+        while url:
+            data = await self._readwise_request('GET', url, params=params)
+            
+            for highlight in data.get('results', []):
+                highlights_by_book.setdefault(highlight.get('book_id'), []).append(highlight)
+            url = data.get('next')  # Pagination
+            params = {}  # Clear params for subsequent pages
+        
+        return highlights_by_book
+    
+    def parse_date(self, value: str) -> datetime:
+        """Parse an ISO-8601 timestamp from Readwise (or our own sync time) as a UTC datetime"""
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed
+    
+    def highlighted_since(self, highlight: Dict, since: Optional[str]) -> bool:
+        """
+        Check whether a highlight was made after `since` (by its highlighted_at date)
+        Highlights without a readable date count as new, so they're never dropped
+        """
+        if not since or not highlight.get('highlighted_at'):
+            return True
+        try:
+            return self.parse_date(highlight['highlighted_at']) > self.parse_date(since)
+        except ValueError:
+            return True
+    
+    def highlight_date_changed(self, book_value: Optional[str], page_value: Optional[str]) -> bool:
+        """
+        Check whether Readwise's last_highlight_at differs from the page's "Last Highlighted" date
+        Notion may reformat the timestamp and drop its seconds, so compare the parsed times to the minute
+        If either side is missing or unreadable, report no change and rely on the count alone
+        """
+        if not book_value or not page_value:
+            return False
+        try:
+            book_minute = self.parse_date(book_value).replace(second=0, microsecond=0)
+            page_minute = self.parse_date(page_value).replace(second=0, microsecond=0)
+        except ValueError:
+            return False
+        return book_minute != page_minute
+    
+    def normalize_title(self, title: str) -> str:
+        """Normalize a title for lookups (Unicode form, surrounding whitespace, case)"""
+        return unicodedata.normalize('NFC', title).strip().casefold()
     
     def normalize_text(self, text: str) -> str:
         """Normalize text for comparison by removing formatting, whitespace, and standardizing"""
-        import re
         # Remove markdown bold/italic formatting
-        text = re.sub(r'\*\*', '', text)
-        text = re.sub(r'\*', '', text)
-        text = re.sub(r'__', '', text)
-        text = re.sub(r'_', '', text)
+        text = MARKDOWN_RE.sub('', text)
         # Remove extra whitespace, newlines, and lowercase
-        text = re.sub(r'\s+', ' ', text.strip())
-        return text.lower()
+        return WHITESPACE_RE.sub(' ', text.strip()).lower()
     
-    def get_existing_page_content(self, page_id: str) -> set:
-        """Get the first 1000 chars of each existing highlight as fingerprints"""
+    def fingerprint(self, text: str) -> bytes:
+        """
+        Fingerprint a highlight by its first 1000 chars (normalized)
+        Stored as a 16-byte hash instead of the text itself to keep memory low
+        """
+        normalized = self.normalize_text(text[:1000])
+        return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).digest()
+    
+    async def get_existing_page_content(self, page_id: str) -> set:
+        """Get the first 1000 chars of each existing highlight as (hashed) fingerprints"""
         url = f"{NOTION_API_BASE}/blocks/{page_id}/children"
         
         existing_fingerprints = set()
@@ -282,9 +643,7 @@ class ReadwiseNotionSync:
             if start_cursor:
                 params['start_cursor'] = start_cursor
             
-            response = requests.get(url, params=params, headers=self.notion_headers)
-            response.raise_for_status()
-            data = response.json()
+            data = await self._notion_request('GET', url, params=params)
             
             # Extract first 1000 chars from QUOTE blocks as fingerprints
             for block in data.get('results', []):
@@ -293,90 +652,152 @@ class ReadwiseNotionSync:
                     text = ''.join([t.get('plain_text', '') for t in block.get('quote', {}).get('rich_text', [])])
                     if text:
                         # Use first 1000 chars as fingerprint
-                        fingerprint = self.normalize_text(text[:1000])
-                        existing_fingerprints.add(fingerprint)
+                        existing_fingerprints.add(self.fingerprint(text))
             
             has_more = data.get('has_more', False)
             start_cursor = data.get('next_cursor')
         
         return existing_fingerprints
     
-    def append_highlights_to_page(self, page_id: str, highlights: List[Dict]):
+    def build_highlight_blocks(self, highlight: Dict, text: Optional[str] = None) -> List[Dict]:
+        """
+        Build the Notion blocks for a single highlight (quote + optional note)
+        Pass text if the caller already read it from the highlight
+        """
+        if text is None:
+            text = highlight.get('text') or ''
+        
+        # Add clean quote block (no visible ID!)
+        blocks = [{
+            "object": "block",
+            "type": "quote",
+            "quote": {
+                "rich_text": [{
+                    "type": "text",
+                    "text": {"content": text[:2000]}
+                }],
+                "color": "default"
+            }
+        }]
+        
+        # Add note if exists
+        if highlight.get('note'):
+            blocks.append({
+                "object": "block",
+                "type": "callout",
+                "callout": {
+                    "rich_text": [{
+                        "type": "text",
+                        "text": {"content": f"Note: {highlight.get('note')[:2000]}"}
+                    }],
+                    "icon": {"emoji": "💭"},
+                    "color": "gray_background"
+                }
+            })
+        
+        return blocks
+    
+    async def append_blocks(self, page_id: str, blocks: List[Dict]):
+        """Append blocks to the end of a Notion page"""
+        url = f"{NOTION_API_BASE}/blocks/{page_id}/children"
+        
+        # Notion allows max 100 blocks per request
+        for i in range(0, len(blocks), 100):
+            chunk = blocks[i:i+100]
+            payload = {"children": chunk}
+            
+            # Notion may have saved the blocks before failing - retrying could duplicate them
+            await self._notion_request('PATCH', url, json=payload, retry_server_errors=False)
+    
+    async def append_highlights_to_page(self, page_id: str, highlights: List[Dict], book_id: int):
         """Append only NEW highlights to the Notion page (skip ones already there)"""
         
         # Sort highlights by creation date (oldest first, so newest end up at bottom)
-        # Readwise returns highlights with 'highlighted_at' timestamp
-        highlights_sorted = sorted(highlights, key=lambda h: h.get('highlighted_at', ''))
+        # Readwise returns highlights with 'highlighted_at' timestamp (or null)
+        highlights_sorted = sorted(highlights, key=lambda h: h.get('highlighted_at') or '')
         
-        # Get fingerprints of existing highlights
-        existing_fingerprints = self.get_existing_page_content(page_id)
-        
-        url = f"{NOTION_API_BASE}/blocks/{page_id}/children"
+        synced_highlight_ids = self.get_synced_highlight_ids(book_id, page_id)
+        existing_fingerprints = set()
+        may_have_edits = False
+        rebuilding = synced_highlight_ids is None
+        
+        if rebuilding:
+            # No index for this page yet (first sync after upgrading, a re-created page,
+            # or --rebuild-index): fall back to reading the page content once
+            existing_fingerprints = await self.get_existing_page_content(page_id)
+            print(f"      🔍 Found {len(existing_fingerprints)} existing highlights on page")
+            # Index ALL of the item's highlights that are on the page, not just the ones
+            # we were given - otherwise older highlights would be re-added on a later --all run
+            all_highlights = await self.get_highlights_for_book(book_id)
+            readwise_fingerprints = {h.get('id'): self.fingerprint(h.get('text') or '') for h in all_highlights}
+            synced_highlight_ids = {highlight_id for highlight_id, fingerprint in readwise_fingerprints.items()
+                                    if highlight_id is not None and fingerprint in existing_fingerprints}
+            # Quotes on the page that match no current highlight text may be highlights edited in
+            # Readwise since they were synced (if there are none, nothing was edited)
+            may_have_edits = bool(existing_fingerprints - set(readwise_fingerprints.values()))
+        else:
+            print(f"      🔍 {len(synced_highlight_ids)} highlights already synced to this page")
         
         # Build blocks for NEW highlights only
         blocks = []
         new_count = 0
         skipped_count = 0
         
-        print(f"      🔍 Found {len(existing_fingerprints)} existing highlights on page")
-        
         for highlight in highlights_sorted:
-            highlight_text = highlight.get('text', '')
+            # Check if this highlight already exists
+            if highlight.get('id') in synced_highlight_ids:
+                skipped_count += 1
+                continue
+            
+            # Read the text once for both the fingerprint and the block (Readwise may send null)
+            highlight_text = highlight.get('text') or ''
             
             # Create fingerprint from first 1000 chars
-            fingerprint = self.normalize_text(highlight_text[:1000])
+            if existing_fingerprints:
+                if self.fingerprint(highlight_text) in existing_fingerprints:
+                    skipped_count += 1
+                    continue
             
-            # Check if this highlight already exists
-            if fingerprint in existing_fingerprints:
+            # While rebuilding, a highlight missing from the page may just have been edited in
+            # Readwise since it was synced (so its text no longer matches) - only add ones made
+            # since the last sync, and record the rest as already on the page
+            if rebuilding and may_have_edits and not self.highlighted_since(highlight, self.last_sync_time):
                 skipped_count += 1
                 continue
             
-            # Add clean quote block (no visible ID!)
-            blocks.append({
-                "object": "block",
-                "type": "quote",
-                "quote": {
-                    "rich_text": [{
-                        "type": "text",
-                        "text": {"content": highlight_text[:2000]}
-                    }],
-                    "color": "default"
-                }
-            })
+            blocks.extend(self.build_highlight_blocks(highlight, highlight_text))
             new_count += 1
-            
-            # Add note if exists
-            if highlight.get('note'):
-                blocks.append({
-                    "object": "block",
-                    "type": "callout",
-                    "callout": {
-                        "rich_text": [{
-                            "type": "text",
-                            "text": {"content": f"Note: {highlight.get('note')[:2000]}"}
-                        }],
-                        "icon": {"emoji": "💭"},
-                        "color": "gray_background"
-                    }
-                })
+        
+        # Everything we were given is on the page once the appends below succeed
+        # (when rebuilding, the highlights found on the page are new to the index too)
+        new_highlight_ids = {h['id'] for h in highlights if h.get('id') is not None}
+        if rebuilding:
+            new_highlight_ids |= synced_highlight_ids
+        else:
+            new_highlight_ids -= synced_highlight_ids
         
         if new_count == 0:
             print(f"      ℹ️  All {len(highlights)} highlights already exist (skipped)")
+            self.record_synced_page(book_id, page_id, new_highlight_ids)
             return
         
         print(f"      ✅ Adding {new_count} new highlights ({skipped_count} already exist)")
         print(f"      📍 Highlights are in chronological order (oldest → newest)")
         
-        # Notion allows max 100 blocks per request
-        for i in range(0, len(blocks), 100):
-            chunk = blocks[i:i+100]
-            payload = {"children": chunk}
-            
-            response = requests.patch(url, headers=self.notion_headers, json=payload)
-            response.raise_for_status()
+        # Forget the index while appending - if a chunk fails part-way through,
+        # the next sync re-reads the page instead of trusting a stale index
+        self.forget_highlight_index(book_id)
+        
+        await self.append_blocks(page_id, blocks)
+        
+        self.record_synced_page(book_id, page_id, new_highlight_ids)
     
-    def create_notion_page(self, book: Dict) -> Dict:
-        """Create a new page in Notion Library database"""
+    async def create_notion_page(self, book: Dict, highlights: Optional[List[Dict]] = None) -> Dict:
+        """
+        Create a new page in Notion Library database
+        Highlights are sent along with the page itself (Notion accepts up to 100 blocks
+        on creation), so most new pages take a single request
+        """
         url = f"{NOTION_API_BASE}/pages"
         
         # Map Readwise category to your Notion category
@@ -445,20 +866,25 @@ class ReadwiseNotionSync:
                 "external": {"url": cover_url}
             }
         
-        response = requests.post(url, headers=self.notion_headers, json=payload)
+        # Add highlights as page content, oldest first (so newest end up at bottom)
+        blocks = []
+        for highlight in sorted(highlights or [], key=lambda h: h.get('highlighted_at') or ''):
+            blocks.extend(self.build_highlight_blocks(highlight))
+        if blocks:
+            payload["children"] = blocks[:100]
         
-        # Print detailed error if it fails
-        if not response.ok:
-            print(f"\n⚠️  Error creating page:")
-            print(f"   Status: {response.status_code}")
-            print(f"   Response: {response.text}")
-            print(f"   Book data: {book.get('title')} - Category: {category}")
+        # Notion may have created the page before failing - retrying could duplicate it
+        page = await self._notion_request(
+            'POST', url, json=payload, retry_server_errors=False,
+            error_message=f"Error creating page ({book.get('title')} - Category: {category})"
+        )
         
-        response.raise_for_status()
+        # Anything past the first 100 blocks has to be appended separately
+        await self.append_blocks(page['id'], blocks[100:])
         
-        return response.json()
+        return page
     
-    def update_notion_page(self, page_id: str, book: Dict):
+    async def update_notion_page(self, page_id: str, book: Dict):
         """Update existing Notion page with new highlight count and last synced"""
         url = f"{NOTION_API_BASE}/pages/{page_id}"
         
@@ -502,19 +928,90 @@ class ReadwiseNotionSync:
                 "external": {"url": cover_url}
             }
         
-        response = requests.patch(url, headers=self.notion_headers, json=payload)
-        
-        # Print detailed error if it fails
-        if not response.ok:
-            print(f"\n⚠️  Error updating page:")
-            print(f"   Status: {response.status_code}")
-            print(f"   Response: {response.text}")
-        
-        response.raise_for_status()
-        
-        return response.json()
+        return await self._notion_request('PATCH', url, json=payload, error_message="Error updating page")
     
-    def full_sync(self):
+    async def _process_book(self, i: int, total: int, book: Dict, existing_pages_map: Dict[str, Dict],
+                            highlights_by_book: Optional[Dict[int, List[Dict]]] = None) -> Tuple[Optional[str], int]:
+        """
+        Sync a single item to Notion
+        highlights_by_book holds pre-fetched new highlights for existing pages (incremental syncs only)
+        Returns (outcome, book_id) where outcome is 'created', 'updated', 'unchanged',
+        'skipped' or None (nothing synced, don't track the ID yet)
+        """
+        async with self.work_semaphore:
+            title = book.get('title', 'Untitled')
+            book_id = book.get('id')
+            
+            print(f"\n[{i}/{total}] Processing: {title}")
+            
+            # Check if page exists using our pre-fetched map
+            existing_page = existing_pages_map.get(self.normalize_title(title))
+            
+            # Check if this was synced before (even if page doesn't exist now)
+            was_synced_before = book_id in self.synced_items
+            
+            if existing_page:
+                print(f"   ✏️  Checking existing page...")
+                
+                # OPTIMIZATION 2: Only fetch highlights if count or last highlight date changed
+                existing_highlight_count = existing_page.get('properties', {}).get('Highlights', {}).get('number', 0)
+                new_highlight_count = book.get('num_highlights', 0)
+                existing_last_highlight = (existing_page.get('properties', {}).get('Last Highlighted', {}).get('date') or {}).get('start')
+                last_highlight_changed = self.highlight_date_changed(book.get('last_highlight_at'), existing_last_highlight)
+                
+                # Only fetch and append highlights if there are NEW ones
+                # (Readwise also lists items whose metadata changed, e.g. a tag edit - skip those)
+                if new_highlight_count > existing_highlight_count or last_highlight_changed:
+                    if new_highlight_count > existing_highlight_count:
+                        print(f"   📝 Found {new_highlight_count - existing_highlight_count} new highlights...")
+                    else:
+                        print(f"   📝 Last highlight date changed, checking for new highlights...")
+                    # For existing pages: only use highlights added or changed since last sync
+                    # This protects manual deletions/edits in Notion
+                    if highlights_by_book is not None:
+                        highlights = highlights_by_book.get(book_id, [])
+                    else:
+                        # Full sync (no last sync time) - check all of the item's highlights
+                        highlights = await self.get_highlights_for_book(book['id'])
+                    if highlights:
+                        await self.append_highlights_to_page(existing_page['id'], highlights, book_id)
+                        # Update page metadata ONLY when highlights were actually added
+                        await self.update_notion_page(existing_page['id'], book)
+                        return 'updated', book_id
+                    
+                    if new_highlight_count > existing_highlight_count:
+                        print(f"   ⚠️  Count increased but no new highlights found (might be a sync timing issue)")
+                        return None, book_id
+                
+                print(f"   ⏭️  No new highlights (still {new_highlight_count} total) - skipping update")
+                # Still track this ID even though we didn't update it
+                return 'unchanged', book_id
+            
+            if was_synced_before:
+                # Item was synced before but page doesn't exist now (user deleted it)
+                print(f"   🗑️  Previously synced (ID: {book_id}) but deleted from Notion - skipping")
+                # Remember the deletion so later syncs don't even search for it
+                self.mark_deleted(book_id)
+                return 'skipped', book_id
+            
+            # Brand new item - never synced before
+            print(f"   ✨ Creating new page (ID: {book_id}, never synced before)...")
+            
+            # For NEW pages: get ALL highlights (not filtered by date)
+            # This ensures first sync gets complete history
+            highlights = []
+            if book.get('num_highlights', 0) > 0:
+                print(f"   📝 Adding all {book['num_highlights']} highlights...")
+                highlights = await self.get_highlights_for_book(book['id'])
+            
+            # Create the page with its highlights in one go
+            new_page = await self.create_notion_page(book, highlights)
+            self.record_synced_page(book_id, new_page['id'],
+                                    {h['id'] for h in highlights if h.get('id') is not None})
+            
+            return 'created', book_id
+    
+    async def full_sync(self):
         """
         Sync items from Readwise to Notion Library
         Only processes items (books, articles, podcasts, etc.) with new highlights since last sync
@@ -526,7 +1023,7 @@ class ReadwiseNotionSync:
         print(f"📊 Tracking {len(self.synced_items)} previously synced items")
         
         # Get items updated since last sync (or all if first run)
-        books = self.get_readwise_books(updated_after=self.last_sync_time)
+        books = await self.get_readwise_books(updated_after=self.last_sync_time)
         
         if len(books) == 0:
             print("✨ No new highlights since last sync!")
@@ -537,88 +1034,71 @@ class ReadwiseNotionSync:
         print(f"   (books, articles, podcasts, tweets, etc.)\n")
         print("=" * 60)
         
+        # Items whose pages we already know were deleted need no Notion requests at all
+        books_to_sync = [book for book in books if book.get('id') not in self.deleted_items]
+        deleted_count = len(books) - len(books_to_sync)
+        if deleted_count > 0:
+            print(f"\n🗑️  Skipping {deleted_count} items previously deleted from Notion")
+        
         # OPTIMIZATION 1: Batch search all titles at once instead of one-by-one
         print(f"\n🔍 Checking which items already exist in Notion...")
-        all_titles = [book.get('title', 'Untitled') for book in books]
-        existing_pages_map = self.batch_search_notion_pages(all_titles)
-        print(f"   Found {len(existing_pages_map)} existing pages")
+        all_titles = [book.get('title', 'Untitled') for book in books_to_sync]
+        
+        # For many changed items in a small library, one unfiltered read of the database
+        # is cheaper for Notion than large OR-of-titles searches
+        find_pages = self.find_existing_pages(all_titles)
+        
+        if self.last_sync_time:
+            # OPTIMIZATION 4: Fetch new highlights for every item in one go (alongside the search)
+            # instead of one Readwise request per updated item
+            existing_pages_map, highlights_by_book = await asyncio.gather(
+                find_pages,
+                self.get_all_highlights_since(self.last_sync_time)
+            )
+        else:
+            existing_pages_map = await find_pages
+            highlights_by_book = None
+        existing_count = len({self.normalize_title(title) for title in all_titles} & existing_pages_map.keys())
+        print(f"   Found {existing_count} existing pages")
+        
+        # OPTIMIZATION 3: Process items concurrently (paced by the Notion rate limiter)
+        tasks = [self._process_book(i, len(books_to_sync), book, existing_pages_map, highlights_by_book)
+                 for i, book in enumerate(books_to_sync, 1)]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        created_count = 0
-        updated_count = 0
-        skipped_count = 0
         synced_ids = []  # Track IDs we process
-        
-        for i, book in enumerate(books, 1):
-            title = book.get('title', 'Untitled')
-            book_id = book.get('id')
-            
-            print(f"\n[{i}/{len(books)}] Processing: {title}")
-            
-            # Check if page exists using our pre-fetched map
-            existing_page = existing_pages_map.get(title)
-            
-            # Check if this was synced before (even if page doesn't exist now)
-            was_synced_before = book_id in self.synced_items
-            
-            if existing_page:
-                print(f"   ✏️  Checking existing page...")
-                
-                # OPTIMIZATION 2: Only fetch highlights if count changed
-                existing_highlight_count = existing_page.get('properties', {}).get('Highlights', {}).get('number', 0)
-                new_highlight_count = book.get('num_highlights', 0)
-                
-                # Only fetch and append highlights if there are NEW ones
-                if new_highlight_count > existing_highlight_count:
-                    print(f"   📝 Found {new_highlight_count - existing_highlight_count} new highlights...")
-                    # For existing pages: only fetch highlights created since last sync
-                    # This protects manual deletions/edits in Notion
-                    highlights = self.get_highlights_for_book(book['id'], updated_after=self.last_sync_time)
-                    if highlights:
-                        self.append_highlights_to_page(existing_page['id'], highlights)
-                        # Update page metadata ONLY when highlights were actually added
-                        self.update_notion_page(existing_page['id'], book)
-                        updated_count += 1
-                        synced_ids.append(book_id)  # Track this ID
-                    else:
-                        print(f"   ⚠️  Count increased but no new highlights found (might be a sync timing issue)")
-                else:
-                    print(f"   ℹ️  No new highlights (still {new_highlight_count} total)")
-                    # Still track this ID even though we didn't update it
-                    synced_ids.append(book_id)
-            elif was_synced_before:
-                # Item was synced before but page doesn't exist now (user deleted it)
-                print(f"   🗑️  Previously synced (ID: {book_id}) but deleted from Notion - skipping")
-                skipped_count += 1
-                # Still track this ID so we remember it was processed
+        outcomes = ['skipped'] * deleted_count
+        failed = []
+        for book, result in zip(books_to_sync, results):
+            if isinstance(result, Exception):
+                failed.append((book, result))
+                continue
+            outcome, book_id = result
+            outcomes.append(outcome)
+            if outcome:
                 synced_ids.append(book_id)
-            else:
-                # Brand new item - never synced before
-                print(f"   ✨ Creating new page (ID: {book_id}, never synced before)...")
-                new_page = self.create_notion_page(book)
-                created_count += 1
-                synced_ids.append(book_id)  # Track this ID
-                
-                # For NEW pages: get ALL highlights (not filtered by date)
-                # This ensures first sync gets complete history
-                if book.get('num_highlights', 0) > 0:
-                    print(f"   📝 Adding all {book['num_highlights']} highlights...")
-                    highlights = self.get_highlights_for_book(book['id'], updated_after=None)
-                    self.append_highlights_to_page(new_page['id'], highlights)
         
         print("\n" + "=" * 60)
         print(f"✅ SYNC COMPLETE!")
-        print(f"   Created: {created_count} new pages")
-        print(f"   Updated: {updated_count} existing pages")
-        if skipped_count > 0:
-            print(f"   Skipped: {skipped_count} previously deleted items")
+        print(f"   Created: {outcomes.count('created')} new pages")
+        print(f"   Updated: {outcomes.count('updated')} existing pages")
+        if outcomes.count('skipped') > 0:
+            print(f"   Skipped: {outcomes.count('skipped')} previously deleted items")
         print(f"   Total processed: {len(books)} items")
         
+        for book, error in failed:
+            print(f"   ❌ Failed: {book.get('title', 'Untitled')} - {type(error).__name__}: {error}")
+        
         # Save tracking data for next run
         self.save_synced_items(synced_ids)
-        self.save_last_sync_time()
+        if failed:
+            # Keep the old sync time so failed items are picked up again next run
+            print(f"⚠️  {len(failed)} items failed - not advancing last sync time")
+        else:
+            self.save_last_sync_time()
 
 
-def main():
+async def main():
     """Run the full sync with optional command-line arguments"""
     # Parse command-line arguments
     parser = argparse.ArgumentParser(
@@ -630,6 +1110,7 @@ Examples:
   python readwise_notion_sync.py --days 7     # Sync last 7 days only
   python readwise_notion_sync.py --days 30    # Sync last 30 days only
   python readwise_notion_sync.py --all        # Sync everything (ignore last sync)
+  python readwise_notion_sync.py --rebuild-index  # Rebuild the highlight index from page content
         """
     )
     parser.add_argument(
@@ -643,6 +1124,11 @@ Examples:
         action='store_true',
         help='Sync all highlights (ignore last sync time)'
     )
+    parser.add_argument(
+        '--rebuild-index',
+        action='store_true',
+        help='Re-read existing pages to rebuild the index of synced highlights (each page the next time it gets new highlights)'
+    )
     
     args = parser.parse_args()
     
@@ -667,25 +1153,28 @@ Examples:
         print("🚀 Notion token: ✅")
         print("🚀 Database ID: ✅\n")
         
-        syncer = ReadwiseNotionSync()
-        
-        # Apply configuration overrides
-        if args.all:
-            print("⚠️  --all flag: Syncing ALL highlights (ignoring last sync time)\n")
-            syncer.last_sync_time = None
-        elif args.days:
-            # Calculate the date N days ago
-            days_ago = datetime.utcnow() - timedelta(days=args.days)
-            syncer.last_sync_time = days_ago.isoformat() + 'Z'
-            print(f"⚠️  --days {args.days}: Syncing highlights from last {args.days} days\n")
-        elif DAYS_TO_SYNC and DAYS_TO_SYNC > 0:
-            # Use configured DAYS_TO_SYNC if set
-            days_ago = datetime.utcnow() - timedelta(days=DAYS_TO_SYNC)
-            syncer.last_sync_time = days_ago.isoformat() + 'Z'
-            print(f"⚙️  Configuration: Syncing highlights from last {DAYS_TO_SYNC} days\n")
-        
-        # Run FULL sync (only items with new highlights)
-        syncer.full_sync()
+        async with ReadwiseNotionSync() as syncer:
+            # Apply configuration overrides
+            if args.all:
+                print("⚠️  --all flag: Syncing ALL highlights (ignoring last sync time)\n")
+                syncer.last_sync_time = None
+            elif args.days:
+                # Calculate the date N days ago
+                days_ago = datetime.utcnow() - timedelta(days=args.days)
+                syncer.last_sync_time = days_ago.isoformat() + 'Z'
+                print(f"⚠️  --days {args.days}: Syncing highlights from last {args.days} days\n")
+            elif DAYS_TO_SYNC and DAYS_TO_SYNC > 0:
+                # Use configured DAYS_TO_SYNC if set
+                days_ago = datetime.utcnow() - timedelta(days=DAYS_TO_SYNC)
+                syncer.last_sync_time = days_ago.isoformat() + 'Z'
+                print(f"⚙️  Configuration: Syncing highlights from last {DAYS_TO_SYNC} days\n")
+            
+            if args.rebuild_index:
+                print("⚠️  --rebuild-index flag: Pages will be re-read to rebuild the highlight index as they get new highlights\n")
+                syncer.forget_all_highlight_indexes()
+            
+            # Run FULL sync (only items with new highlights)
+            await syncer.full_sync()
         
         print("\n✅ Sync completed successfully!")
         
@@ -702,4 +1191,4 @@ Examples:
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())